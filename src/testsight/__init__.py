@@ -3,12 +3,23 @@
 from __future__ import annotations
 
 from importlib import metadata
+from typing import TYPE_CHECKING
 
 try:  # pragma: no cover - best effort during development
     __version__ = metadata.version("testsight")
 except metadata.PackageNotFoundError:  # pragma: no cover - local/dev installs
     __version__ = "0.1.0"
 
-from .runner import TestsightRunner
+if TYPE_CHECKING:  # pragma: no cover
+    from .runner import TestsightRunner
 
 __all__ = ["TestsightRunner", "__version__"]
+
+
+def __getattr__(name: str) -> object:
+    # Imported lazily so ``testsight --version`` skips the analysis modules.
+    if name == "TestsightRunner":
+        from .runner import TestsightRunner
+
+        return TestsightRunner
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
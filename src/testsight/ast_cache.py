@@ -0,0 +1,108 @@
+"""Persistent on-disk cache for per-module analysis results."""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import sys
+import tempfile
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+from . import __version__
+
+try:  # pragma: no cover - optional accelerated hashing
+    import xxhash
+except ModuleNotFoundError:  # pragma: no cover
+    xxhash = None  # type: ignore[assignment]
+
+if TYPE_CHECKING:  # pragma: no cover
+    from .indexer import ModuleData
+
+
+CACHE_FORMAT = 4
+CACHE_VERSION: tuple[object, ...] = (
+    CACHE_FORMAT,
+    sys.implementation.cache_tag,
+    __version__,
+)
+
+
+def _version_tag() -> str:
+    return "-".join(str(part) for part in CACHE_VERSION)
+
+
+def compute_digest(data: bytes, *salt: str) -> str:
+    """Hash file contents together with any context affecting the analysis."""
+
+    hasher = xxhash.xxh3_128() if xxhash is not None else hashlib.sha256()
+    for item in salt:
+        hasher.update(item.encode("utf-8"))
+        hasher.update(b"\0")
+    hasher.update(data)
+    return hasher.hexdigest()
+
+
+def _entry_path(cache_dir: Path, digest: str) -> Path:
+    return cache_dir / "ast" / _version_tag() / digest[:2] / f"{digest}.json"
+
+
+def _is_name(value: object) -> bool:
+    return type(value) is str
+
+
+def load(cache_dir: Path, digest: str) -> "ModuleData | None":
+    """Return the cached analysis for ``digest`` or ``None`` on a miss.
+
+    Entries are plain JSON and are validated before use, so an unreadable,
+    corrupt or tampered entry is treated as a miss rather than trusted.
+    """
+
+    from .indexer import ModuleData
+
+    try:
+        with _entry_path(cache_dir, digest).open("rb") as handle:
+            payload = json.load(handle)
+        exports = payload["exports"]
+        imports = payload["imports"]
+        if type(exports) is not list or type(imports) is not list:
+            return None
+        if not all(map(_is_name, exports)):
+            return None
+        pairs: list[tuple[str, str | None]] = []
+        for target, symbol in imports:
+            if not _is_name(target) or not (symbol is None or _is_name(symbol)):
+                return None
+            pairs.append((sys.intern(target), symbol))
+    except (OSError, ValueError, TypeError, KeyError, RecursionError):
+        return None
+    return ModuleData(exports=frozenset(exports), imports=tuple(pairs))
+
+
+def store(cache_dir: Path, digest: str, data: "ModuleData") -> None:
+    """Persist ``data`` for ``digest``; failures are silently ignored."""
+
+    target = _entry_path(cache_dir, digest)
+    try:
+        if not cache_dir.exists():
+            cache_dir.mkdir(parents=True, exist_ok=True)
+            (cache_dir / ".gitignore").write_text("*\n", encoding="utf-8")
+        target.parent.mkdir(parents=True, exist_ok=True)
+        payload = {
+            "exports": sorted(data.exports),
+            "imports": [list(pair) for pair in data.imports],
+        }
+        fd, tmp_name = tempfile.mkstemp(dir=target.parent, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as handle:
+                json.dump(payload, handle, separators=(",", ":"))
+            os.replace(tmp_name, target)
+        except BaseException:
+            os.unlink(tmp_name)
+            raise
+    except OSError:
+        return
+
+
+__all__ = ["CACHE_VERSION", "compute_digest", "load", "store"]
@@ -2,20 +2,38 @@
 
 from __future__ import annotations
 
-import argparse
 import json
-import shlex
 import sys
 from dataclasses import replace
 from pathlib import Path
-from typing import Sequence
+from types import SimpleNamespace
+from typing import TYPE_CHECKING, Sequence
 
 from . import __version__
-from .config import DiffSource, RunnerConfig, load_config, parse_command
-from .runner import ChangeDetectionError, TestsightRunner
+from .config import (
+    DiffSource,
+    RunnerConfig,
+    find_repo_root,
+    load_config,
+    parse_command,
+    split_shell_words,
+)
+
+if TYPE_CHECKING:  # pragma: no cover
+    import argparse
+
+# Flags understood without building the argparse parser (hook/CI hot path).
+FAST_PATH_FLAGS: dict[str, str] = {
+    "--json": "json",
+    "--dry-run": "dry_run",
+    "--quiet": "quiet",
+    "--version": "version",
+}
 
 
 def build_parser() -> argparse.ArgumentParser:
+    import argparse
+
     parser = argparse.ArgumentParser(
         prog="testsight",
         description="Run only the pytest modules impacted by recent changes.",
@@ -60,6 +78,11 @@ def build_parser() -> argparse.ArgumentParser:
     parser.add_argument(
         "--json", action="store_true", help="Output impacted tests as JSON and exit."
     )
+    parser.add_argument(
+        "--changed-only",
+        action="store_true",
+        help="Only select changed files that are tests themselves (skips import analysis).",
+    )
     parser.add_argument(
         "--quiet", action="store_true", help="Suppress informational output."
     )
@@ -68,6 +91,16 @@ def build_parser() -> argparse.ArgumentParser:
         action="store_true",
         help="Do not echo the test command before execution.",
     )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Disable the persistent analysis cache.",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        help="Worker processes used to analyse modules (default: CPU count, 1 disables).",
+    )
     parser.add_argument(
         "--min-token-length",
         type=int,
@@ -123,6 +156,11 @@ def build_parser() -> argparse.ArgumentParser:
     parser.add_argument(
         "--version", action="store_true", help="Show Testsight version and exit."
     )
+    parser.add_argument(
+        "--print-root",
+        action="store_true",
+        help="Print the detected repository root and exit.",
+    )
     parser.add_argument(
         "paths",
         nargs="*",
@@ -143,6 +181,10 @@ def apply_cli_overrides(config: RunnerConfig, args: argparse.Namespace) -> Runne
         overrides["quiet"] = True
     if args.no_print_command:
         overrides["print_command"] = False
+    if args.no_cache:
+        overrides["cache_dir"] = None
+    if args.workers is not None:
+        overrides["parallel_workers"] = args.workers
 
     if args.source_roots:
         overrides["source_roots"] = tuple(args.source_roots)
@@ -191,7 +233,7 @@ def apply_cli_overrides(config: RunnerConfig, args: argparse.Namespace) -> Runne
     if args.head:
         diff = replace(diff, head=args.head)
     if args.diff_args:
-        diff_args = tuple(shlex.split(args.diff_args))
+        diff_args = tuple(split_shell_words(args.diff_args))
         diff = replace(diff, mode=DiffSource.CUSTOM, custom_args=diff_args)
     if args.include_untracked:
         diff = replace(diff, include_untracked=True)
@@ -220,14 +262,64 @@ def resolve_changed_paths(
     return resolved
 
 
+def _fast_path_args(arguments: Sequence[str]) -> SimpleNamespace:
+    """Namespace equivalent to ``build_parser().parse_args(arguments)``."""
+
+    args = SimpleNamespace(
+        config=None,
+        root=None,
+        diff_mode=None,
+        base=None,
+        head=None,
+        diff_args=None,
+        include_untracked=False,
+        test_command=None,
+        dry_run=False,
+        list=False,
+        json=False,
+        changed_only=False,
+        quiet=False,
+        no_print_command=False,
+        no_cache=False,
+        workers=None,
+        min_token_length=None,
+        fallback_score=None,
+        source_roots=None,
+        exclude_dirs=None,
+        test_dir_markers=None,
+        test_prefixes=None,
+        test_suffixes=None,
+        stopwords=None,
+        env=None,
+        version=False,
+        print_root=False,
+        paths=[],
+    )
+    for flag in arguments:
+        setattr(args, FAST_PATH_FLAGS[flag], True)
+    return args
+
+
+def parse_args(argv: Sequence[str] | None = None) -> argparse.Namespace:
+    arguments = list(sys.argv[1:] if argv is None else argv)
+    if all(flag in FAST_PATH_FLAGS for flag in arguments):
+        return _fast_path_args(arguments)  # type: ignore[return-value]
+    return build_parser().parse_args(arguments)
+
+
 def main(argv: Sequence[str] | None = None) -> int:
-    parser = build_parser()
-    args = parser.parse_args(argv)
+    args = parse_args(argv)
 
     if args.version:
         print(__version__)
         return 0
 
+    if args.print_root:
+        print(find_repo_root(args.root))
+        return 0
+
+    from .runner import ChangeDetectionError, TestsightRunner
+
     root = args.root
     config = load_config(root=root, config_path=args.config)
     config = apply_cli_overrides(config, args)
@@ -236,9 +328,11 @@ def main(argv: Sequence[str] | None = None) -> int:
 
     runner = TestsightRunner(config)
 
+    plan = runner.plan_changed_tests if args.changed_only else runner.plan
+
     try:
         if args.json:
-            tests = runner.plan(explicit_paths)
+            tests = plan(explicit_paths)
             payload = [
                 str(path.relative_to(config.root))
                 if path.is_relative_to(config.root)
@@ -248,8 +342,8 @@ def main(argv: Sequence[str] | None = None) -> int:
             print(json.dumps(payload, ensure_ascii=False, indent=2))
             return 0
 
-        if config.dry_run:
-            tests = runner.plan(explicit_paths)
+        if config.dry_run or args.changed_only:
+            tests = plan(explicit_paths)
             return runner.execute(tests)
 
         if explicit_paths is not None:
@@ -7,13 +7,9 @@ import shlex
 from dataclasses import dataclass, field, replace
 from enum import Enum
 from pathlib import Path
+from types import ModuleType
 from typing import Iterable, Mapping, MutableMapping, Sequence
 
-try:  # pragma: no cover - Python 3.10 compatibility shim
-    import tomllib  # type: ignore[attr-defined]
-except ModuleNotFoundError:  # pragma: no cover
-    tomllib = None  # type: ignore[assignment]
-
 
 DEFAULT_EXCLUDE_DIRS: tuple[str, ...] = (
     ".git",
@@ -75,6 +71,44 @@ class DiffConfig:
     diff_filter: str = "ACMR"
     include_untracked: bool = False
 
+    def as_git_args(self) -> list[str]:
+        """Return the single ``git diff`` invocation listing changed files.
+
+        Output is NUL-separated (``-z``) so paths never need unquoting.
+        """
+
+        filter_arg = f"--diff-filter={self.diff_filter}"
+        if self.mode is DiffSource.STAGED:
+            return ["git", "diff", "--name-only", "-z", "--cached", filter_arg]
+        if self.mode is DiffSource.UNSTAGED:
+            return ["git", "diff", "--name-only", "-z", filter_arg]
+        if self.mode is DiffSource.RANGE:
+            if not self.base or not self.head:
+                raise ValueError(
+                    "Diff mode 'range' requires both base and head revisions"
+                )
+            return [
+                "git",
+                "diff",
+                "--name-only",
+                "-z",
+                filter_arg,
+                f"{self.base}..{self.head}",
+            ]
+        if self.mode is DiffSource.CUSTOM:
+            custom = list(self.custom_args)
+            if not custom:
+                raise ValueError("Custom diff mode requires explicit git arguments")
+            args = ["git", "diff", *custom]
+            if "-z" not in custom:
+                args.insert(2, "-z")
+            if "--name-only" not in custom:
+                args.insert(2, "--name-only")
+            if not any(arg.startswith("--diff-filter") for arg in custom):
+                args.insert(2, filter_arg)
+            return args
+        raise ValueError(f"Unsupported diff mode: {self.mode}")  # pragma: no cover
+
 
 @dataclass(frozen=True)
 class TestNamingRules:
@@ -83,16 +117,29 @@ class TestNamingRules:
     directory_markers: tuple[str, ...] = ("tests",)
     filename_prefixes: tuple[str, ...] = ("test_",)
     filename_suffixes: tuple[str, ...] = ("_test.py",)
+    marker_set: frozenset[str] = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        # Tuples let str.startswith/endswith test every affix in one C call.
+        object.__setattr__(self, "filename_prefixes", tuple(self.filename_prefixes))
+        object.__setattr__(self, "filename_suffixes", tuple(self.filename_suffixes))
+        object.__setattr__(self, "marker_set", frozenset(self.directory_markers))
 
     def is_test_file(self, path: Path, root: Path, suffixes: Sequence[str]) -> bool:
-        relative = path.relative_to(root)
-        parts = relative.parts
-        name = path.name
+        return self.is_test_parts(path.relative_to(root).parts, suffixes)
+
+    def is_test_parts(self, parts: tuple[str, ...], suffixes: Sequence[str]) -> bool:
+        """Like :meth:`is_test_file` for a path already split relative to the root."""
 
-        in_marked_directory = any(part in self.directory_markers for part in parts[:-1])
-        has_prefix = any(name.startswith(prefix) for prefix in self.filename_prefixes)
-        has_suffix = any(name.endswith(suffix) for suffix in self.filename_suffixes)
-        extension_ok = any(name.endswith(suffix) for suffix in suffixes)
+        if not parts:
+            return False
+        name = parts[-1]
+
+        markers = self.marker_set
+        in_marked_directory = any(part in markers for part in parts[:-1])
+        has_prefix = name.startswith(self.filename_prefixes)
+        has_suffix = name.endswith(self.filename_suffixes)
+        extension_ok = name.endswith(tuple(suffixes))
 
         if in_marked_directory:
             return (has_prefix or has_suffix) and extension_ok
@@ -106,6 +153,26 @@ class TokenConfig:
     minimum_length: int = 3
     fallback_score: int = 12
     stopwords: tuple[str, ...] = DEFAULT_GENERIC_TOKENS
+    stopword_set: frozenset[str] = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        object.__setattr__(self, "stopword_set", frozenset(self.stopwords))
+
+
+def default_cache_dir() -> str | None:
+    """Per-user analysis cache location, kept outside of any checkout.
+
+    Cache entries are keyed by file contents, so one directory can safely serve
+    every repository. Returns ``None`` (caching disabled) without a home folder.
+    """
+
+    base = os.environ.get("XDG_CACHE_HOME") or os.environ.get("LOCALAPPDATA")
+    if not base:
+        try:
+            base = str(Path.home() / ".cache")
+        except RuntimeError:
+            return None
+    return os.path.join(base, "testsight")
 
 
 @dataclass(frozen=True)
@@ -124,16 +191,59 @@ class RunnerConfig:
     quiet: bool = False
     print_command: bool = True
     env: Mapping[str, str] | None = None
+    cache_dir: str | None = field(default_factory=default_cache_dir)
+    parallel_workers: int | None = None
+    exclude_set: frozenset[str] = field(init=False, repr=False, compare=False)
+    suffixes_by_length: tuple[str, ...] = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        # Derived lookups used in per-file hot loops; recomputed by ``replace``.
+        object.__setattr__(self, "python_suffixes", tuple(self.python_suffixes))
+        object.__setattr__(self, "exclude_set", frozenset(self.exclude_dirs))
+        object.__setattr__(
+            self,
+            "suffixes_by_length",
+            tuple(
+                suffix
+                for suffix in sorted(self.python_suffixes, key=len, reverse=True)
+                if suffix
+            ),
+        )
 
     def with_overrides(self, **updates: object) -> "RunnerConfig":
         return replace(self, **updates)
 
+    @property
+    def cache_path(self) -> Path | None:
+        """Absolute location of the analysis cache, or ``None`` when disabled."""
+
+        if not self.cache_dir:
+            return None
+        return self.root / self.cache_dir
+
+
+# Characters ``str.split()`` and ``shlex.split`` disagree on: quotes, escapes and
+# whitespace that ``str.split()`` breaks on but shlex keeps inside a word.
+_SHELL_SPECIAL_CHARS = frozenset(
+    "\"'\\"
+    "\x0b\x0c\x1c\x1d\x1e\x1f\x85\xa0\u1680\u2000\u2001\u2002\u2003\u2004"
+    "\u2005\u2006\u2007\u2008\u2009\u200a\u2028\u2029\u202f\u205f\u3000"
+)
+
+
+def split_shell_words(value: str) -> list[str]:
+    """``shlex.split`` with a fast path for strings without quotes or escapes."""
+
+    if _SHELL_SPECIAL_CHARS.isdisjoint(value):
+        return value.split()
+    return shlex.split(value)
+
 
 def parse_command(command: str | Sequence[str] | None) -> tuple[str, ...]:
     if command is None:
         return DEFAULT_TEST_COMMAND
     if isinstance(command, str):
-        tokens = shlex.split(command)
+        tokens = split_shell_words(command)
     else:
         tokens = list(command)
     if not tokens:
@@ -152,13 +262,41 @@ def find_repo_root(start: Path | None = None) -> Path:
     return current
 
 
-def _load_toml(path: Path) -> Mapping[str, object]:
-    if tomllib is None:
-        raise RuntimeError(
-            "Reading configuration files requires tomllib (Python 3.11+) or tomli as a dependency."
-        )
-    with path.open("rb") as handle:
-        return tomllib.load(handle)
+# Parsed TOML documents keyed by path, each with the (mtime_ns, size) it was
+# parsed at; an edited file replaces its entry instead of adding another.
+_TOML_CACHE: dict[str, tuple[tuple[int, int], Mapping[str, object]]] = {}
+
+
+def _toml_module() -> ModuleType:
+    # Imported lazily: CLI-only invocations without config files never need it.
+    try:
+        import tomllib
+    except ModuleNotFoundError:  # pragma: no cover - Python 3.10 compatibility shim
+        try:
+            import tomli as tomllib  # type: ignore[no-redef]
+        except ModuleNotFoundError:
+            raise RuntimeError(
+                "Reading configuration files requires tomllib (Python 3.11+) or tomli as a dependency."
+            ) from None
+    return tomllib
+
+
+def _load_toml(path: Path) -> Mapping[str, object] | None:
+    """Parse ``path``, returning ``None`` when it does not exist."""
+
+    try:
+        handle = path.open("rb")
+    except FileNotFoundError:
+        return None
+    with handle:
+        stat = os.fstat(handle.fileno())
+        version = (stat.st_mtime_ns, stat.st_size)
+        cached = _TOML_CACHE.get(str(path))
+        if cached is not None and cached[0] == version:
+            return cached[1]
+        data = _toml_module().load(handle)
+        _TOML_CACHE[str(path)] = (version, data)
+        return data
 
 
 def load_config_from_mapping(
@@ -177,7 +315,7 @@ def load_config_from_mapping(
     ) -> tuple[str, ...]:
         value = mapping.get(key, default)
         if isinstance(value, str):
-            return tuple(shlex.split(value))
+            return tuple(split_shell_words(value))
         if isinstance(value, Iterable):
             return tuple(str(item) for item in value)
         raise TypeError(f"Configuration key '{key}' must be a sequence or string.")
@@ -210,6 +348,13 @@ def load_config_from_mapping(
     if "print-command" in data:
         overrides["print_command"] = bool(data["print-command"])
 
+    if "parallel-workers" in data:
+        overrides["parallel_workers"] = int(data["parallel-workers"])
+
+    if "cache-dir" in data:
+        cache_dir = data["cache-dir"]
+        overrides["cache_dir"] = str(cache_dir) if cache_dir else None
+
     if "env" in data:
         env_section = data["env"]
         if not isinstance(env_section, Mapping):
@@ -301,24 +446,22 @@ def load_config(
     root = find_repo_root(root)
     config = RunnerConfig(root=root)
 
-    potential_files: list[Path] = []
+    # Candidates are opened directly instead of probed with exists(): a missing
+    # file costs a single failed open().
+    potential_files: tuple[Path, ...]
     if config_path:
-        potential_files.append(config_path)
+        potential_files = (config_path,)
     else:
-        potential_files.extend(
-            path
-            for path in (
-                root / "testsight.toml",
-                root / ".testsightrc",
-                root / "pyproject.toml",
-            )
-            if path.exists()
+        potential_files = (
+            root / "testsight.toml",
+            root / ".testsightrc",
+            root / "pyproject.toml",
         )
 
     for path in potential_files:
-        if not path.exists():
-            continue
         data = _load_toml(path)
+        if data is None:
+            continue
         if path.name == "pyproject.toml":
             section = (
                 data.get("tool", {}).get("testsight")
@@ -353,4 +496,7 @@ def load_config(
             quiet=env_map["quiet"].lower() in {"1", "true", "yes"}
         )
 
+    if "no-cache" in env_map and env_map["no-cache"].lower() in {"1", "true", "yes"}:
+        config = config.with_overrides(cache_dir=None)
+
     return config
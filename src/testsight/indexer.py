@@ -4,12 +4,26 @@ from __future__ import annotations
 
 import ast
 import os
+import sys
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 from dataclasses import dataclass
+from functools import lru_cache, partial
+from itertools import islice
 from pathlib import Path
-from typing import Iterable, Mapping, MutableMapping
+from typing import Callable, Iterable, Iterator, Mapping, MutableMapping, Sequence
 
+from . import ast_cache
 from .config import RunnerConfig
 
+# Below this many modules, process start-up costs more than serial parsing.
+PARALLEL_MIN_MODULES = 256
+
+# Reader threads and in-flight files used to overlap disk reads with parsing.
+PREFETCH_WORKERS = 4
+PREFETCH_WINDOW = 128
+
 
 @dataclass(frozen=True)
 class ModuleInfo:
@@ -17,12 +31,18 @@ class ModuleInfo:
     path: Path
     package_parts: tuple[str, ...]
     is_package: bool
+    relative_parts: tuple[str, ...] = ()
 
 
 @dataclass(frozen=True)
 class ModuleData:
     exports: frozenset[str]
-    imports: Mapping[str, frozenset[str | None]]
+    # ``(target_module, symbol)`` pairs; ``symbol`` is None for module imports.
+    imports: tuple[tuple[str, str | None], ...]
+
+
+# Shared result for unreadable or unparsable modules; ModuleData is immutable.
+_EMPTY_DATA = ModuleData(frozenset(), ())
 
 
 @dataclass(frozen=True)
@@ -30,6 +50,17 @@ class ModuleIndex:
     modules: Mapping[str, ModuleInfo]
     by_path: Mapping[Path, str]
 
+    def fingerprint(self) -> tuple[tuple[str, int, int] | None, ...]:
+        """Return ``(path, mtime_ns, size)`` for every module, ordered by name.
+
+        Two indexes with equal fingerprints describe the same sources, so any
+        analysis derived from one can be reused for the other.
+        """
+
+        return tuple(
+            _stat_key(self.modules[name].path) for name in sorted(self.modules)
+        )
+
 
 class ModuleIndexer:
     """Build an importable module index for a repository."""
@@ -38,30 +69,37 @@ class ModuleIndexer:
         self.config = config
 
     def iter_python_files(self) -> Iterable[Path]:
-        root = self.config.root
-        exclude = set(self.config.exclude_dirs)
-        suffixes = self.config.python_suffixes
+        for path, _ in self.iter_python_entries():
+            yield path
 
-        for dirpath, dirnames, filenames in os.walk(root):
-            dirpath_path = Path(dirpath)
-            try:
-                relative_parts = dirpath_path.relative_to(root).parts
-            except ValueError:
-                # Should not happen, but guard against symlinks pointing outside.
-                relative_parts = ()
+    def iter_python_entries(self) -> Iterable[tuple[Path, tuple[str, ...]]]:
+        """Yield ``(path, parts)`` pairs, ``parts`` being relative to the root."""
 
-            dirnames[:] = [name for name in dirnames if name not in exclude]
-            if any(part in exclude for part in relative_parts):
-                continue
+        exclude = self.config.exclude_set
+        suffixes = self.config.python_suffixes
 
-            for filename in filenames:
-                if not any(filename.endswith(suffix) for suffix in suffixes):
-                    continue
-                yield dirpath_path / filename
+        def scan(
+            dirpath: str, parts: tuple[str, ...]
+        ) -> Iterator[tuple[Path, tuple[str, ...]]]:
+            try:
+                entries = os.scandir(dirpath)
+            except OSError:
+                return
+            with entries:
+                for entry in entries:
+                    if entry.is_dir():
+                        # Symlinked directories are not followed, matching os.walk.
+                        if entry.name not in exclude and not entry.is_symlink():
+                            yield from scan(entry.path, (*parts, entry.name))
+                    elif entry.name.endswith(suffixes):
+                        yield Path(entry.path), (*parts, entry.name)
+
+        yield from scan(str(self.config.root), ())
 
     def derive_module_name(self, path: Path) -> str | None:
-        relative = path.relative_to(self.config.root)
-        parts = list(relative.parts)
+        return self.module_name_from_parts(path.relative_to(self.config.root).parts)
+
+    def module_name_from_parts(self, parts: tuple[str, ...]) -> str | None:
         for source_root in self.config.source_roots:
             if parts and parts[0] == source_root:
                 parts = parts[1:]
@@ -74,13 +112,13 @@ class ModuleIndexer:
             parts = parts[:-1]
         else:
             matched_suffix = None
-            for suffix in sorted(self.config.python_suffixes, key=len, reverse=True):
-                if suffix and filename.endswith(suffix):
+            for suffix in self.config.suffixes_by_length:
+                if filename.endswith(suffix):
                     matched_suffix = suffix
                     break
             if not matched_suffix:
                 return None
-            parts[-1] = filename[: -len(matched_suffix)] if matched_suffix else filename
+            parts = (*parts[:-1], filename[: -len(matched_suffix)])
 
         if not parts:
             return None
@@ -92,11 +130,14 @@ class ModuleIndexer:
         modules: MutableMapping[str, ModuleInfo] = {}
         by_path: MutableMapping[Path, str] = {}
 
-        for path in self.iter_python_files():
-            module = self.derive_module_name(path)
+        for path, parts in self.iter_python_entries():
+            module = self.module_name_from_parts(parts)
             if not module:
                 continue
-            is_package = path.name == "__init__.py"
+            # Module names recur as dict keys across the index, imports and the
+            # reverse index; interning lets lookups short-circuit on identity.
+            module = sys.intern(module)
+            is_package = parts[-1] == "__init__.py"
             package_parts = (
                 tuple(module.split("."))
                 if is_package
@@ -107,6 +148,7 @@ class ModuleIndexer:
                 path=path,
                 package_parts=package_parts,
                 is_package=is_package,
+                relative_parts=parts,
             )
             modules[module] = info
             by_path[path] = module
@@ -114,15 +156,40 @@ class ModuleIndexer:
         return ModuleIndex(modules=dict(modules), by_path=dict(by_path))
 
 
-def safe_parse(source: Path) -> ast.AST | None:
+def read_source(source: Path) -> bytes | None:
+    try:
+        return source.read_bytes()
+    except OSError:
+        return None
+
+
+def _parse_bytes(data: bytes, filename: str) -> ast.AST | None:
+    # Straight to the compiler: no type comments, no inherited __future__ flags.
     try:
-        text = source.read_text(encoding="utf-8")
-    except (UnicodeDecodeError, OSError):
+        return compile(data, filename, "exec", ast.PyCF_ONLY_AST, dont_inherit=True)
+    except (SyntaxError, ValueError):
         return None
+
+
+def _stat_key(source: Path) -> tuple[str, int, int] | None:
     try:
-        return ast.parse(text, filename=str(source))
-    except SyntaxError:
+        stat = source.stat()
+    except OSError:
+        return None
+    return str(source), stat.st_mtime_ns, stat.st_size
+
+
+def safe_parse(source: Path) -> ast.AST | None:
+    data = read_source(source)
+    if data is None:
         return None
+    return _parse_bytes(data, str(source))
+
+
+def clear_parse_cache() -> None:
+    """Drop every in-process analysis result."""
+
+    _ANALYSIS_MEMO.clear()
 
 
 def resolve_import_module(
@@ -130,11 +197,17 @@ def resolve_import_module(
 ) -> str | None:
     if level == 0:
         return module
+    return _resolve_relative_import(info.name, info.is_package, module, level)
 
-    if info.is_package:
-        base_parts = list(info.name.split("."))
+
+@lru_cache(maxsize=65536)
+def _resolve_relative_import(
+    info_name: str, is_package: bool, module: str | None, level: int
+) -> str | None:
+    if is_package:
+        base_parts = info_name.split(".")
     else:
-        base_parts = list(info.name.split(".")[:-1])
+        base_parts = info_name.split(".")[:-1]
 
     if level > 1:
         drop = min(len(base_parts), level - 1)
@@ -148,81 +221,327 @@ def resolve_import_module(
     return result
 
 
-def analyze_module(info: ModuleInfo) -> ModuleData:
-    tree = safe_parse(info.path)
-    exports: set[str] = set()
-    imports: dict[str, set[str | None]] = {}
+_StatKey = tuple[str, int, int]
+_MemoKey = tuple[ModuleInfo, Path | None, bool]
+_Prefetch = tuple[_StatKey | None, bytes | None, str | None]
+
+# In-process analysis results keyed by module and options. Each entry remembers
+# the (path, mtime, size) it was computed for and is replaced once that changes,
+# so repeated runs in one process hold at most one result per module.
+_ANALYSIS_MEMO: dict[_MemoKey, tuple[_StatKey, ModuleData]] = {}
+
+
+def _memoized(memo_key: _MemoKey, key: _StatKey) -> ModuleData | None:
+    entry = _ANALYSIS_MEMO.get(memo_key)
+    if entry is not None and entry[0] == key:
+        return entry[1]
+    return None
+
+
+def analyze_module(
+    info: ModuleInfo,
+    cache_dir: Path | None = None,
+    collect_exports: bool = True,
+) -> ModuleData:
+    """Collect imports (and, unless disabled, module-level exports) of ``info``."""
+
+    key = _stat_key(info.path)
+    if key is None:
+        return _EMPTY_DATA
+    return _analyze_source(info, cache_dir, collect_exports, key, None, None)
+
+
+def _read_for_analysis(
+    info: ModuleInfo, cache_dir: Path | None, collect_exports: bool
+) -> _Prefetch:
+    """Stat, read and hash ``info`` off the main thread (see ``analyze_modules``)."""
+
+    key = _stat_key(info.path)
+    if key is None or _memoized((info, cache_dir, collect_exports), key) is not None:
+        return key, None, None
+    data = read_source(info.path)
+    digest = None
+    if data is not None and cache_dir is not None:
+        digest = _cache_digest(info, data, collect_exports)
+    return key, data, digest
+
+
+def _cache_digest(info: ModuleInfo, data: bytes, collect_exports: bool) -> str:
+    return ast_cache.compute_digest(
+        data, info.name, str(info.is_package), str(collect_exports)
+    )
+
+
+def _analyze_source(
+    info: ModuleInfo,
+    cache_dir: Path | None,
+    collect_exports: bool,
+    key: _StatKey,
+    data: bytes | None,
+    digest: str | None,
+) -> ModuleData:
+    memo_key = (info, cache_dir, collect_exports)
+    memoized = _memoized(memo_key, key)
+    if memoized is not None:
+        return memoized
+
+    if data is None:
+        data = read_source(info.path)
+        if data is None:
+            return _EMPTY_DATA
+
+    module_data: ModuleData | None = None
+    if cache_dir is not None:
+        digest = digest or _cache_digest(info, data, collect_exports)
+        module_data = ast_cache.load(cache_dir, digest)
+
+    if module_data is None:
+        module_data = _analyze_tree(
+            info, _parse_bytes(data, str(info.path)), collect_exports
+        )
+        if cache_dir is not None and digest is not None:
+            ast_cache.store(cache_dir, digest, module_data)
+
+    _ANALYSIS_MEMO[memo_key] = (key, module_data)
+    return module_data
+
+
+def _prefetched(
+    infos: Sequence[ModuleInfo], cache_dir: Path | None, collect_exports: bool
+) -> Iterator[_Prefetch]:
+    """Yield ``_read_for_analysis`` results in order, reading ahead on threads.
+
+    At most ``PREFETCH_WINDOW`` files are buffered so memory stays bounded.
+    """
+
+    with ThreadPoolExecutor(max_workers=PREFETCH_WORKERS) as pool:
+        remaining = iter(infos)
+        pending: deque[Future[_Prefetch]] = deque(
+            pool.submit(_read_for_analysis, info, cache_dir, collect_exports)
+            for info in islice(remaining, PREFETCH_WINDOW)
+        )
+        while pending:
+            result = pending.popleft().result()
+            info = next(remaining, None)
+            if info is not None:
+                pending.append(
+                    pool.submit(_read_for_analysis, info, cache_dir, collect_exports)
+                )
+            yield result
+
+
+class _ModuleVisitor:
+    """Collect imports and exports by walking statement lists only.
 
-    if tree is None:
-        return ModuleData(frozenset(exports), {})
+    Expressions never contain imports or module-level bindings, so only
+    statement bodies are visited. Imports are collected from every scope;
+    exports only from module scope, including compound statements such as
+    ``if TYPE_CHECKING:`` or ``try``/``except ImportError`` blocks.
+    """
 
-    def add_import(target_module: str | None, symbol: str | None) -> None:
+    def __init__(self, info: ModuleInfo):
+        self.info = info
+        self.exports: set[str] = set()
+        self.imports: dict[tuple[str, str | None], None] = {}
+
+    def visit_body(self, body: Sequence[ast.AST], module_scope: bool) -> None:
+        handlers = _VISITOR_HANDLERS
+        for node in body:
+            handler = handlers.get(type(node))
+            if handler is not None:
+                handler(self, node, module_scope)
+
+    def add_import(self, target_module: str | None, symbol: str | None) -> None:
+        if not target_module:
+            return
+        self.imports[(sys.intern(target_module), symbol)] = None
+
+    def visit_definition(
+        self,
+        node: ast.ClassDef | ast.FunctionDef | ast.AsyncFunctionDef,
+        module_scope: bool,
+    ) -> None:
+        if module_scope:
+            self.exports.add(node.name)
+        self.visit_body(node.body, False)
+
+    def visit_assign(self, node: ast.Assign, module_scope: bool) -> None:
+        if not module_scope:
+            return
+        for target in node.targets:
+            if isinstance(target, ast.Name):
+                self.exports.add(target.id)
+
+    def visit_import(self, node: ast.Import, module_scope: bool) -> None:
+        for alias in node.names:
+            binding = alias.asname or alias.name.split(".")[0]
+            self.add_import(alias.name, None)
+            if binding and module_scope:
+                self.exports.add(binding)
+
+    def visit_import_from(self, node: ast.ImportFrom, module_scope: bool) -> None:
+        target_module = resolve_import_module(self.info, node.module, node.level or 0)
         if not target_module:
             return
-        imports.setdefault(target_module, set()).add(symbol)
-
-    for node in ast.walk(tree):
-        if isinstance(node, (ast.ClassDef, ast.FunctionDef, ast.AsyncFunctionDef)):
-            exports.add(node.name)
-        elif isinstance(node, ast.Assign):
-            for target in node.targets:
-                if isinstance(target, ast.Name):
-                    exports.add(target.id)
-        elif isinstance(node, ast.Import):
-            for alias in node.names:
-                binding = alias.asname or alias.name.split(".")[0]
-                add_import(alias.name, None)
-                if binding:
-                    exports.add(binding)
-        elif isinstance(node, ast.ImportFrom):
-            target_module = resolve_import_module(info, node.module, node.level or 0)
-            if not target_module:
+        for alias in node.names:
+            if alias.name == "*":
+                self.add_import(target_module, None)
                 continue
-            for alias in node.names:
-                if alias.name == "*":
-                    add_import(target_module, None)
-                    continue
-                binding = alias.asname or alias.name
-                add_import(target_module, binding)
-                exports.add(binding)
-
-    frozen_imports = {module: frozenset(symbols) for module, symbols in imports.items()}
-    return ModuleData(exports=frozenset(exports), imports=frozen_imports)
+            binding = alias.asname or alias.name
+            self.add_import(target_module, binding)
+            if module_scope:
+                self.exports.add(binding)
+
+    def visit_compound(self, node: ast.AST, module_scope: bool) -> None:
+        for field in ("body", "orelse", "finalbody"):
+            body = getattr(node, field, None)
+            if body:
+                self.visit_body(body, module_scope)
+        for clause in getattr(node, "handlers", None) or getattr(node, "cases", ()):
+            self.visit_body(clause.body, module_scope)
+
+
+_VISITOR_HANDLERS: dict[type[ast.AST], Callable[..., None]] = {
+    ast.ClassDef: _ModuleVisitor.visit_definition,
+    ast.FunctionDef: _ModuleVisitor.visit_definition,
+    ast.AsyncFunctionDef: _ModuleVisitor.visit_definition,
+    ast.Assign: _ModuleVisitor.visit_assign,
+    ast.Import: _ModuleVisitor.visit_import,
+    ast.ImportFrom: _ModuleVisitor.visit_import_from,
+    ast.If: _ModuleVisitor.visit_compound,
+    ast.For: _ModuleVisitor.visit_compound,
+    ast.AsyncFor: _ModuleVisitor.visit_compound,
+    ast.While: _ModuleVisitor.visit_compound,
+    ast.With: _ModuleVisitor.visit_compound,
+    ast.AsyncWith: _ModuleVisitor.visit_compound,
+    ast.Try: _ModuleVisitor.visit_compound,
+    ast.Match: _ModuleVisitor.visit_compound,
+}
+if hasattr(ast, "TryStar"):  # pragma: no branch - Python 3.11+
+    _VISITOR_HANDLERS[ast.TryStar] = _ModuleVisitor.visit_compound
+
+
+def _analyze_tree(
+    info: ModuleInfo, tree: ast.AST | None, collect_exports: bool = True
+) -> ModuleData:
+    if not isinstance(tree, ast.Module):
+        return _EMPTY_DATA
+
+    visitor = _ModuleVisitor(info)
+    # Exports are only recorded at module scope, so treating the top level as
+    # a nested scope skips them entirely.
+    visitor.visit_body(tree.body, collect_exports)
+
+    return ModuleData(
+        exports=frozenset(visitor.exports), imports=tuple(visitor.imports)
+    )
+
+
+def analyze_modules(
+    infos: Sequence[ModuleInfo],
+    cache_dir: Path | None = None,
+    workers: int | None = None,
+    collect_exports: bool = True,
+) -> list[ModuleData]:
+    """Analyze ``infos`` in order, fanning out to worker processes when worthwhile."""
+
+    if workers is None:
+        workers = os.cpu_count() or 1
+
+    # Memo hits are answered in-process; only the misses are worth fanning out.
+    results: list[ModuleData | None] = [None] * len(infos)
+    keys = [_stat_key(info.path) for info in infos]
+    pending: list[int] = []
+    for position, (info, key) in enumerate(zip(infos, keys)):
+        if key is None:
+            results[position] = _EMPTY_DATA
+            continue
+        results[position] = _memoized((info, cache_dir, collect_exports), key)
+        if results[position] is None:
+            pending.append(position)
+
+    if pending and workers > 1 and len(pending) >= PARALLEL_MIN_MODULES:
+        try:
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                analyzed = list(
+                    executor.map(
+                        partial(
+                            analyze_module,
+                            cache_dir=cache_dir,
+                            collect_exports=collect_exports,
+                        ),
+                        [infos[position] for position in pending],
+                        chunksize=32,
+                    )
+                )
+        except (OSError, NotImplementedError, BrokenProcessPool):
+            pass  # Fall back to serial analysis on restricted platforms.
+        else:
+            for position, module_data in zip(pending, analyzed):
+                results[position] = module_data
+                memo_key = (infos[position], cache_dir, collect_exports)
+                _ANALYSIS_MEMO[memo_key] = (keys[position], module_data)
+            pending = []
+
+    remaining = [infos[position] for position in pending]
+    prefetched = _prefetched(remaining, cache_dir, collect_exports)
+    for position, info, (key, data, digest) in zip(pending, remaining, prefetched):
+        if key is None:
+            results[position] = _EMPTY_DATA
+            continue
+        results[position] = _analyze_source(
+            info, cache_dir, collect_exports, key, data, digest
+        )
+    return results  # type: ignore[return-value]
 
 
 def build_module_data(
     index: ModuleIndex,
-) -> tuple[dict[str, ModuleData], dict[str, dict[str | None, set[str]]]]:
+    cache_dir: Path | None = None,
+    workers: int | None = None,
+) -> tuple[dict[str, ModuleData], dict[str, dict[str | None, frozenset[str]]]]:
     data: dict[str, ModuleData] = {}
     reverse: dict[str, dict[str | None, set[str]]] = {}
 
-    for module_name, info in index.modules.items():
-        module_data = analyze_module(info)
-        imports_mutable: dict[str, set[str | None]] = {
-            target: set(symbols) for target, symbols in module_data.imports.items()
-        }
-
-        for target_module, symbols in list(imports_mutable.items()):
-            for symbol in list(symbols):
-                if symbol is None:
-                    continue
-                candidate = f"{target_module}.{symbol}"
-                if candidate in index.modules:
-                    imports_mutable.setdefault(candidate, set()).add(None)
-
-        augmented_imports = {
-            module: frozenset(symbols) for module, symbols in imports_mutable.items()
-        }
-        module_data = ModuleData(exports=module_data.exports, imports=augmented_imports)
+    modules = index.modules
+    # Only imports from packages with indexed submodules can name a submodule.
+    has_submodules = frozenset(
+        module.rpartition(".")[0] for module in modules if "." in module
+    )
+    # Exports are only needed for changed modules; the resolver computes them lazily.
+    analyzed = analyze_modules(
+        list(modules.values()), cache_dir, workers, collect_exports=False
+    )
+    for module_name, module_data in zip(modules, analyzed):
+        imports = module_data.imports
+        augmented: list[tuple[str, str | None]] = []
+        for target_module, symbol in imports:
+            if symbol is None or target_module not in has_submodules:
+                continue
+            candidate = ".".join((target_module, symbol))
+            if candidate in modules:
+                augmented.append((sys.intern(candidate), None))
+        if augmented:
+            imports = tuple(dict.fromkeys((*imports, *augmented)))
+            module_data = ModuleData(exports=module_data.exports, imports=imports)
         data[module_name] = module_data
 
-        for target_module, symbols in module_data.imports.items():
-            for symbol in symbols or {None}:
-                reverse.setdefault(target_module, {}).setdefault(symbol, set()).add(
-                    module_name
-                )
+        for target_module, symbol in imports:
+            # Results unpickled from the disk cache or worker processes are not
+            # interned, so re-intern the keys that end up in the reverse index.
+            by_symbol = reverse.get(target_module)
+            if by_symbol is None:
+                by_symbol = reverse[sys.intern(target_module)] = {}
+            dependants = by_symbol.get(symbol)
+            if dependants is None:
+                dependants = by_symbol[symbol] = set()
+            dependants.add(module_name)
 
-    return data, reverse
+    frozen = {
+        target: {symbol: frozenset(names) for symbol, names in by_symbol.items()}
+        for target, by_symbol in reverse.items()
+    }
+    return data, frozen
 
 
 __all__ = [
@@ -231,5 +550,7 @@ __all__ = [
     "ModuleIndex",
     "ModuleIndexer",
     "analyze_module",
+    "analyze_modules",
     "build_module_data",
+    "clear_parse_cache",
 ]
@@ -2,13 +2,51 @@
 
 from __future__ import annotations
 
-from collections import deque
-from dataclasses import dataclass
+import re
+from dataclasses import dataclass, field
+from functools import cached_property, lru_cache
 from pathlib import Path
-from typing import Mapping, Sequence
+from typing import Collection, Iterable, Mapping, Sequence
 
 from .config import RunnerConfig
-from .indexer import ModuleData, ModuleIndex, ModuleInfo
+from .indexer import ModuleData, ModuleIndex, ModuleInfo, analyze_module
+
+
+_EMPTY_FS: frozenset[str] = frozenset()
+
+# Split before an upper-case letter that follows a lower-case one, or that starts
+# a capitalised word after an acronym ("HTTPServer" -> "HTTP", "Server").
+_CAMEL_BOUNDARY = re.compile(r"(?<=[a-z])(?=[A-Z])|(?<=.)(?=[A-Z][a-z])", re.DOTALL)
+
+
+def _split_camel(raw: str) -> list[str]:
+    if raw.isascii():
+        return _CAMEL_BOUNDARY.split(raw)
+    # The pattern only knows ASCII case; keep Unicode-aware boundaries elsewhere.
+    parts: list[str] = []
+    start = 0
+    for idx in range(1, len(raw)):
+        if raw[idx].isupper() and (
+            raw[idx - 1].islower() or (idx + 1 < len(raw) and raw[idx + 1].islower())
+        ):
+            parts.append(raw[start:idx])
+            start = idx
+    parts.append(raw[start:])
+    return parts
+
+
+@lru_cache(maxsize=4096)
+def _split_token(token: str, minimum: int, stopwords: frozenset[str]) -> frozenset[str]:
+    token = token.replace("-", "_")
+    parts: list[str] = []
+    for raw in token.split("_"):
+        if not raw:
+            continue
+        parts.extend(part.lower() for part in _split_camel(raw))
+    tokens = set(parts)
+    tokens.add(token.lower())
+    tokens.update(p[:-1] for p in parts if len(p) > 4 and p.endswith("s"))
+    return frozenset(t for t in tokens if len(t) >= minimum and t not in stopwords)
 
 
 class TokenCollector:
@@ -17,59 +55,127 @@ class TokenCollector:
     def __init__(self, root: Path, config: RunnerConfig):
         self.root = root
         self.config = config
+        self._min_len = config.tokens.minimum_length
+        self._stopwords: frozenset[str] = config.tokens.stopword_set
+        self._cache: dict[Path, tuple[frozenset[str], frozenset[str]]] = {}
 
-    def _split_token(self, token: str) -> set[str]:
-        token = token.replace("-", "_")
-        parts: list[str] = []
-        for raw in token.split("_"):
-            if not raw:
-                continue
-            camel_parts: list[str] = []
-            start = 0
-            for idx in range(1, len(raw)):
-                if raw[idx].isupper() and (
-                    raw[idx - 1].islower()
-                    or (idx + 1 < len(raw) and raw[idx + 1].islower())
-                ):
-                    camel_parts.append(raw[start:idx].lower())
-                    start = idx
-            camel_parts.append(raw[start:].lower())
-            parts.extend(camel_parts)
-        tokens = set(parts)
-        tokens.add(token.lower())
-        tokens.update(p[:-1] for p in parts if len(p) > 4 and p.endswith("s"))
-        minimum = self.config.tokens.minimum_length
-        stopwords = set(self.config.tokens.stopwords)
-        return {t for t in tokens if len(t) >= minimum and t not in stopwords}
+    def _split_token(self, token: str) -> frozenset[str]:
+        return _split_token(token, self._min_len, self._stopwords)
 
-    def path_tokens(self, path: Path) -> frozenset[str]:
-        tokens: set[str] = set()
+    def path_and_dir_tokens(self, path: Path) -> tuple[frozenset[str], frozenset[str]]:
+        """Return ``(path_tokens, directory_tokens)`` from a single walk of ``path``."""
+
+        cached = self._cache.get(path)
+        if cached is not None:
+            return cached
         try:
             parts = path.relative_to(self.root).parts
         except ValueError:
             parts = path.parts
-        for part in parts:
-            base = part.split(".")[0]
-            tokens.update(self._split_token(base))
-        return frozenset(tokens)
+        tokens: set[str] = set()
+        for part in parts[:-1]:
+            tokens.update(self._split_token(part.split(".")[0]))
+        directory = frozenset(tokens)
+        if parts:
+            tokens.update(self._split_token(parts[-1].split(".")[0]))
+        result = self._cache[path] = (frozenset(tokens), directory)
+        return result
+
+    def path_tokens(self, path: Path) -> frozenset[str]:
+        return self.path_and_dir_tokens(path)[0]
 
     def directory_tokens(self, path: Path) -> frozenset[str]:
-        tokens: set[str] = set()
-        try:
-            parts = path.relative_to(self.root).parts[:-1]
-        except ValueError:
-            parts = path.parts[:-1]
-        for part in parts:
-            base = part.split(".")[0]
-            tokens.update(self._split_token(base))
-        return frozenset(tokens)
+        return self.path_and_dir_tokens(path)[1]
+
+
+@dataclass(frozen=True)
+class ImportGraph:
+    """``reverse_imports`` with module names and symbols interned to small ints.
+
+    Graph states are packed as ``module_id * stride + symbol_id`` where symbol id
+    ``0`` stands for "the whole module" (``None``).
+    """
+
+    module_ids: Mapping[str, int]
+    module_names: Sequence[str]
+    symbol_ids: Mapping[str, int]
+    # Per module id: symbol id -> ids of the modules importing that symbol.
+    reverse: Sequence[Mapping[int, tuple[int, ...]]]
+
+    @property
+    def stride(self) -> int:
+        return len(self.symbol_ids) + 1
+
+    @classmethod
+    def build(
+        cls,
+        modules: Iterable[str],
+        reverse_imports: Mapping[str, Mapping[str | None, Collection[str]]],
+    ) -> "ImportGraph":
+        module_ids: dict[str, int] = {}
+        symbol_ids: dict[str, int] = {}
+
+        def module_id(name: str) -> int:
+            mid = module_ids.get(name)
+            if mid is None:
+                mid = module_ids[name] = len(module_ids)
+            return mid
+
+        for name in modules:
+            module_id(name)
+        edges: list[tuple[int, int, tuple[int, ...]]] = []
+        for target, by_symbol in reverse_imports.items():
+            target_id = module_id(target)
+            for symbol, dependants in by_symbol.items():
+                if symbol is None:
+                    symbol_id = 0
+                else:
+                    symbol_id = symbol_ids.setdefault(symbol, len(symbol_ids) + 1)
+                edges.append(
+                    (target_id, symbol_id, tuple(module_id(d) for d in dependants))
+                )
+
+        reverse: list[dict[int, tuple[int, ...]]] = [{} for _ in module_ids]
+        for target_id, symbol_id, dependant_ids in edges:
+            reverse[target_id][symbol_id] = dependant_ids
+        return cls(
+            module_ids=module_ids,
+            module_names=list(module_ids),
+            symbol_ids=symbol_ids,
+            reverse=reverse,
+        )
 
 
 @dataclass
 class ImpactAnalysis:
     modules: Mapping[str, ModuleInfo]
     module_data: Mapping[str, ModuleData]
-    reverse_imports: Mapping[str, Mapping[str | None, set[str]]]
+    reverse_imports: Mapping[str, Mapping[str | None, frozenset[str]]]
+    cache_dir: Path | None = None
+    _exports: dict[str, frozenset[str]] = field(
+        default_factory=dict, init=False, repr=False, compare=False
+    )
+
+    def exports(self, module: str) -> frozenset[str]:
+        """Module-level names defined by ``module``, computed on first request."""
+
+        cached = self._exports.get(module)
+        if cached is not None:
+            return cached
+        data = self.module_data.get(module)
+        info = self.modules.get(module)
+        if data and data.exports:
+            exports = data.exports
+        elif info is not None:
+            exports = analyze_module(info, self.cache_dir).exports
+        else:
+            exports = _EMPTY_FS
+        self._exports[module] = exports
+        return exports
+
+    @cached_property
+    def graph(self) -> ImportGraph:
+        return ImportGraph.build(self.modules, self.reverse_imports)
 
 
 class ImpactResolver:
@@ -82,16 +188,28 @@ class ImpactResolver:
         self.index = index
         self.analysis = analysis
         self.tokenizer = TokenCollector(config.root, config)
-        self.test_tokens = {
-            info.path: self.tokenizer.path_tokens(info.path)
-            for info in index.modules.values()
-            if self._is_test_module(info)
-        }
-        self.test_dir_tokens = {
-            path: self.tokenizer.directory_tokens(path) for path in self.test_tokens
+        self._is_test: dict[str, bool] = {
+            name: self._is_test_module(info) for name, info in index.modules.items()
         }
+        # ``(path, path tokens, directory tokens)`` for every indexed test module.
+        self._tests: list[tuple[Path, frozenset[str], frozenset[str]]] = [
+            (info.path, *self.tokenizer.path_and_dir_tokens(info.path))
+            for name, info in index.modules.items()
+            if self._is_test[name]
+        ]
+        # Inverted indexes: the fallback matcher only scores tests sharing a token.
+        self._token_to_tests = _invert(
+            (path, tokens) for path, tokens, _ in self._tests
+        )
+        self._dir_token_to_tests = _invert(
+            (path, dir_tokens) for path, _, dir_tokens in self._tests
+        )
 
     def _is_test_module(self, info: ModuleInfo) -> bool:
+        if info.relative_parts:
+            return self.config.naming.is_test_parts(
+                info.relative_parts, self.config.python_suffixes
+            )
         return self.config.naming.is_test_file(
             info.path,
             self.config.root,
@@ -104,102 +222,127 @@ class ImpactResolver:
 
         by_path = self.index.by_path
         modules = self.index.modules
-        module_data = self.analysis.module_data
-        reverse_imports = self.analysis.reverse_imports
+        # Repeated paths would only repeat the tokenisation and scoring below.
+        changed_paths = list(dict.fromkeys(changed_paths))
 
         changed_modules = {by_path[path] for path in changed_paths if path in by_path}
 
         impacted_modules: set[str] = set()
 
         if changed_modules:
-            queue: deque[tuple[str, str | None]] = deque()
+            graph = self.analysis.graph
+            stride = graph.stride
+            reverse = graph.reverse
+            module_names = graph.module_names
+            symbol_ids = graph.symbol_ids
+            is_test = self._is_test
+
+            # Visit order is irrelevant (results are a set), so a list stack will do.
+            stack: list[int] = []
             for module in changed_modules:
-                data = module_data.get(module)
-                if data:
-                    for symbol in data.exports:
-                        queue.append((module, symbol))
-                queue.append((module, None))
-
-            visited: set[tuple[str, str | None]] = set()
-            while queue:
-                module, symbol = queue.popleft()
-                if (module, symbol) in visited:
+                base = graph.module_ids[module] * stride
+                for symbol in self.analysis.exports(module):
+                    # Symbols nobody imports have no id and cannot propagate.
+                    symbol_id = symbol_ids.get(symbol)
+                    if symbol_id is not None:
+                        stack.append(base + symbol_id)
+                stack.append(base)
+
+            visited: set[int] = set()
+            while stack:
+                state = stack.pop()
+                if state in visited:
                     continue
-                visited.add((module, symbol))
+                visited.add(state)
+                module_id, symbol_id = divmod(state, stride)
 
-                info = modules.get(module)
-                if info and self._is_test_module(info):
+                module = module_names[module_id]
+                if is_test.get(module, False):
                     impacted_modules.add(module)
                     continue
 
-                reverse = reverse_imports.get(module, {})
-                if symbol is None:
-                    dependants = reverse.get(None, set())
-                else:
-                    dependants = set(reverse.get(symbol, set()))
-                    dependants.update(reverse.get(None, set()))
-
-                for dependant in dependants:
-                    dep_data = module_data.get(dependant)
-                    if not dep_data:
-                        continue
-                    imported_symbols = dep_data.imports.get(module, frozenset())
-
-                    if symbol is None:
-                        if None in imported_symbols:
-                            queue.append((dependant, None))
-                    else:
-                        if symbol in imported_symbols:
-                            queue.append((dependant, symbol))
-                        if None in imported_symbols:
-                            queue.append((dependant, None))
+                # ``reverse`` is keyed by the imported symbol, so membership already
+                # tells which binding each dependant pulled in from ``module``.
+                by_symbol = reverse[module_id]
+                if symbol_id:
+                    for dependant in by_symbol.get(symbol_id, ()):
+                        stack.append(dependant * stride + symbol_id)
+                for dependant in by_symbol.get(0, ()):
+                    stack.append(dependant * stride)
 
         fallback_threshold = self.config.tokens.fallback_score
         if fallback_threshold <= 0:
             fallback_threshold = 1
 
-        staged_tokens = [self.tokenizer.path_tokens(path) for path in changed_paths]
-        staged_dir_tokens = [
-            self.tokenizer.directory_tokens(path) for path in changed_paths
+        # A test must share a directory token with the change, and the path
+        # tokens it shares with one changed path must weigh at least the
+        # threshold. The directory prefilter is cheap and selective, so it
+        # goes first and may skip scoring altogether.
+        changed_tokens = [
+            self.tokenizer.path_and_dir_tokens(path) for path in changed_paths
         ]
-
-        for path, tokens in self.test_tokens.items():
-            if path not in by_path:
-                continue
-            scores = [
-                sum(len(token) for token in tokens.intersection(staged))
-                for staged in staged_tokens
-            ]
-            score = max(scores) if scores else 0
-            if score < fallback_threshold:
-                continue
-
-            dir_match = any(
-                self.test_dir_tokens.get(path, frozenset()).intersection(dir_tokens)
-                for dir_tokens in staged_dir_tokens
-            )
-            if not dir_match:
-                continue
-            module_name = by_path.get(path)
-            if module_name:
-                impacted_modules.add(module_name)
-
-        return sorted(
-            modules[module].path
-            for module in impacted_modules
-            if module in modules and self._is_test_module(modules[module])
+        candidates = _lookup(
+            self._dir_token_to_tests, [dir_tokens for _, dir_tokens in changed_tokens]
         )
-
-
-def prepare_analysis(index: ModuleIndex) -> ImpactAnalysis:
+        if candidates:
+            token_to_tests = self._token_to_tests
+            for path_tokens, _ in changed_tokens:
+                # Accumulate scores along the postings of each changed token, so
+                # only tests that actually share a token are ever touched.
+                scores: dict[Path, int] = {}
+                for token in path_tokens:
+                    tests = token_to_tests.get(token)
+                    if not tests:
+                        continue
+                    weight = len(token)
+                    for test in tests:
+                        scores[test] = scores.get(test, 0) + weight
+                impacted_modules.update(
+                    by_path[test]
+                    for test, score in scores.items()
+                    if score >= fallback_threshold and test in candidates
+                )
+
+        # Only test modules are ever added above, so no re-filtering is needed.
+        return sorted(modules[module].path for module in impacted_modules)
+
+
+def _invert(
+    tokens_by_path: Iterable[tuple[Path, frozenset[str]]],
+) -> dict[str, set[Path]]:
+    inverted: dict[str, set[Path]] = {}
+    for path, tokens in tokens_by_path:
+        for token in tokens:
+            inverted.setdefault(token, set()).add(path)
+    return inverted
+
+
+def _lookup(
+    inverted: Mapping[str, set[Path]], token_sets: Sequence[frozenset[str]]
+) -> set[Path]:
+    found: set[Path] = set()
+    for tokens in token_sets:
+        for token in tokens:
+            paths = inverted.get(token)
+            if paths:
+                found.update(paths)
+    return found
+
+
+def prepare_analysis(
+    index: ModuleIndex,
+    cache_dir: Path | None = None,
+    workers: int | None = None,
+) -> ImpactAnalysis:
     from .indexer import build_module_data
 
-    module_data, reverse_imports = build_module_data(index)
+    module_data, reverse_imports = build_module_data(index, cache_dir, workers)
     return ImpactAnalysis(
         modules=index.modules,
         module_data=module_data,
         reverse_imports=reverse_imports,
+        cache_dir=cache_dir,
     )
 
 
-__all__ = ["ImpactResolver", "ImpactAnalysis", "prepare_analysis"]
+__all__ = ["ImpactResolver", "ImpactAnalysis", "ImportGraph", "prepare_analysis"]
@@ -2,17 +2,23 @@
 
 from __future__ import annotations
 
+import itertools
 import os
 import subprocess
+import tempfile
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Sequence
+from typing import Iterator, Sequence
 
-from .config import DiffSource, RunnerConfig
-from .indexer import ModuleIndexer
+from .config import RunnerConfig
+from .indexer import ModuleIndexer, clear_parse_cache
 from .resolver import ImpactAnalysis, ImpactResolver, prepare_analysis
 
 
+UNTRACKED_GIT_ARGS = ("git", "ls-files", "--others", "--exclude-standard", "-z")
+GIT_READ_SIZE = 64 * 1024
+
+
 class ChangeDetectionError(RuntimeError):
     """Raised when git diff inspection fails."""
 
@@ -22,111 +28,56 @@ class ChangeDetector:
     config: RunnerConfig
 
     def collect(self) -> list[Path]:
-        mode = self.config.diff.mode
         root = self.config.root
         paths: list[Path] = []
 
-        if mode is DiffSource.STAGED:
-            args = [
-                "git",
-                "diff",
-                "--name-only",
-                "--cached",
-                f"--diff-filter={self.config.diff.diff_filter}",
-            ]
-        elif mode is DiffSource.UNSTAGED:
-            args = [
-                "git",
-                "diff",
-                "--name-only",
-                f"--diff-filter={self.config.diff.diff_filter}",
-            ]
-        elif mode is DiffSource.RANGE:
-            base = self.config.diff.base
-            head = self.config.diff.head
-            if not base or not head:
-                raise ChangeDetectionError(
-                    "Diff mode 'range' requires both base and head revisions"
-                )
-            args = [
-                "git",
-                "diff",
-                "--name-only",
-                f"--diff-filter={self.config.diff.diff_filter}",
-                f"{base}..{head}",
-            ]
-        elif mode is DiffSource.CUSTOM:
-            custom = list(self.config.diff.custom_args)
-            if not custom:
-                raise ChangeDetectionError(
-                    "Custom diff mode requires explicit git arguments"
-                )
-            args = ["git", "diff", *custom]
-            if "--name-only" not in custom:
-                args.insert(2, "--name-only")
-            if not any(arg.startswith("--diff-filter") for arg in custom):
-                args.insert(2, f"--diff-filter={self.config.diff.diff_filter}")
-        else:  # pragma: no cover - defensive programming
-            raise ChangeDetectionError(f"Unsupported diff mode: {mode}")
-
-        result = subprocess.run(
-            args,
-            cwd=root,
-            text=True,
-            capture_output=True,
-            check=False,
-        )
-        if result.returncode not in (0, 1):
-            raise ChangeDetectionError(
-                result.stderr.strip() or "Failed to execute git diff"
+        try:
+            args = self.config.diff.as_git_args()
+        except ValueError as exc:
+            raise ChangeDetectionError(str(exc)) from None
+
+        entries = self._iter_git(args, "Failed to execute git diff")
+        if self.config.diff.include_untracked:
+            entries = itertools.chain(
+                entries,
+                self._iter_git(UNTRACKED_GIT_ARGS, "Failed to list untracked files"),
             )
 
-        for line in result.stdout.splitlines():
-            entry = line.strip()
+        suffixes = self.config.python_suffixes
+        for entry in entries:
             if not entry:
                 continue
-            path = (root / entry).resolve()
-            if not path.exists():
-                continue
-            if not any(
-                path.name.endswith(suffix) for suffix in self.config.python_suffixes
-            ):
+            path = (root / os.fsdecode(entry)).resolve()
+            # Staged files may since have been removed from the working tree.
+            if not path.name.endswith(suffixes) or not os.path.exists(path):
                 continue
             paths.append(path)
 
-        if self.config.diff.include_untracked:
-            ls_files = subprocess.run(
-                ["git", "ls-files", "--others", "--exclude-standard"],
-                cwd=root,
-                text=True,
-                capture_output=True,
-                check=False,
-            )
-            if ls_files.returncode not in (0, 1):
-                raise ChangeDetectionError(
-                    ls_files.stderr.strip() or "Failed to list untracked files"
-                )
-            for line in ls_files.stdout.splitlines():
-                entry = line.strip()
-                if not entry:
-                    continue
-                path = (root / entry).resolve()
-                if not path.exists():
-                    continue
-                if not any(
-                    path.name.endswith(suffix) for suffix in self.config.python_suffixes
-                ):
-                    continue
-                paths.append(path)
-
-        unique: list[Path] = []
-        seen: set[Path] = set()
-        for path in paths:
-            if path in seen:
-                continue
-            seen.add(path)
-            unique.append(path)
-        return unique
+        return list(dict.fromkeys(paths))
+
+    def _iter_git(self, args: Sequence[str], failure: str) -> Iterator[bytes]:
+        """Yield NUL-separated entries from git as its output arrives."""
+
+        # stderr goes to a file rather than a pipe: git may emit more warnings
+        # than a pipe buffer holds before stdout is drained, which would block it.
+        with tempfile.TemporaryFile() as errors:
+            with subprocess.Popen(
+                args,
+                cwd=self.config.root,
+                stdout=subprocess.PIPE,
+                stderr=errors,
+            ) as proc:
+                assert proc.stdout is not None
+                pending = b""
+                while chunk := proc.stdout.read1(GIT_READ_SIZE):
+                    *entries, pending = (pending + chunk).split(b"\0")
+                    yield from entries
+                yield pending
+                returncode = proc.wait()
+            if returncode not in (0, 1):
+                errors.seek(0)
+                stderr = os.fsdecode(errors.read()).strip()
+                raise ChangeDetectionError(stderr or failure)
 
 
 class TestsightRunner:
@@ -137,6 +88,16 @@ class TestsightRunner:
     def __init__(self, config: RunnerConfig):
         self.config = config
         self.indexer = ModuleIndexer(config)
+        self._cache_key: tuple[object, ...] | None = None
+        self._cached_resolver: ImpactResolver | None = None
+        clear_parse_cache()
+
+    def invalidate(self) -> None:
+        """Forget the cached resolver and every in-process analysis result."""
+
+        self._cache_key = None
+        self._cached_resolver = None
+        clear_parse_cache()
 
     def collect_changes(self) -> list[Path]:
         detector = ChangeDetector(self.config)
@@ -146,10 +107,48 @@ class TestsightRunner:
         paths = (
             list(changed_paths) if changed_paths is not None else self.collect_changes()
         )
+        return self.plan_impacted_tests(paths)
+
+    def plan_changed_tests(
+        self, changed_paths: Sequence[Path] | None = None
+    ) -> list[Path]:
+        """Return changed files that are test modules themselves.
+
+        Cheap alternative to :meth:`plan`: no module index or import graph is built.
+        """
+
+        paths = (
+            list(changed_paths) if changed_paths is not None else self.collect_changes()
+        )
+        root = self.config.root
+        naming = self.config.naming
+        suffixes = self.config.python_suffixes
+        return sorted(
+            {
+                path
+                for path in paths
+                if path.is_relative_to(root)
+                and naming.is_test_file(path, root, suffixes)
+            }
+        )
+
+    def plan_impacted_tests(self, changed_paths: Sequence[Path]) -> list[Path]:
+        if not changed_paths:
+            return []
+        return self._impact_resolver().resolve(changed_paths)
+
+    def _impact_resolver(self) -> ImpactResolver:
+        # Walking the tree is cheap next to analysis; reuse the resolver for as
+        # long as the indexed sources and the configuration stay the same.
         index = self.indexer.build()
-        analysis = prepare_analysis(index)
-        resolver = ImpactResolver(self.config, index, analysis)
-        return resolver.resolve(paths)
+        key = (self.config, index.fingerprint())
+        if self._cached_resolver is None or key != self._cache_key:
+            analysis = prepare_analysis(
+                index, self.config.cache_path, self.config.parallel_workers
+            )
+            self._cached_resolver = ImpactResolver(self.config, index, analysis)
+            self._cache_key = key
+        return self._cached_resolver
 
     def execute(self, tests: Sequence[Path]) -> int:
         if not tests:
@@ -157,13 +156,16 @@ class TestsightRunner:
                 print("Testsight: no impacted tests detected.")
             return 0
 
+        # One relative_to() per test serves both the listing and the command.
+        root = self.config.root
+        rel: list[str] = []
+        for path in tests:
+            try:
+                rel.append(str(path.relative_to(root)))
+            except ValueError:
+                rel.append(str(path))
+
         if not self.config.quiet:
-            rel = [
-                str(path.relative_to(self.config.root))
-                if path.is_relative_to(self.config.root)
-                else str(path)
-                for path in tests
-            ]
             print("Impacted test modules (" + str(len(rel)) + "):")
             for item in rel:
                 print(f"  - {item}")
@@ -171,12 +173,7 @@ class TestsightRunner:
         if self.config.dry_run:
             return 0
 
-        command = list(self.config.test_command) + [
-            str(path.relative_to(self.config.root))
-            if path.is_relative_to(self.config.root)
-            else str(path)
-            for path in tests
-        ]
+        command = list(self.config.test_command) + rel
         if self.config.print_command and not self.config.quiet:
             print("Running:", " ".join(command))
 
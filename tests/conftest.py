@@ -48,6 +48,12 @@ class RepoHelper:
         return config
 
 
+@pytest.fixture(autouse=True)
+def isolated_cache(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    # Keep the default per-user analysis cache out of the real home directory.
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path / "xdg-cache"))
+
+
 @pytest.fixture
 def repo(tmp_path: Path) -> Iterable[RepoHelper]:
     root = tmp_path / "repo"
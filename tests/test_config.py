@@ -0,0 +1,81 @@
+from __future__ import annotations
+
+import shlex
+
+import pytest
+
+from testsight.config import (
+    DEFAULT_TEST_COMMAND,
+    RunnerConfig,
+    find_repo_root,
+    load_config,
+    parse_command,
+    split_shell_words,
+)
+
+
+@pytest.mark.parametrize(
+    "command",
+    [
+        "pytest -q --maxfail=1",
+        "  tox   -e py310 -- ",
+        'pytest -k "billing and not slow"',
+        "pytest -k 'tax or fee'",
+        r"pytest tests/with\ space",
+        "pytest\xa0-q",
+        "pytest\x0c-q",
+        "a\u2003b",
+    ],
+)
+def test_split_shell_words_matches_shlex(command):
+    assert split_shell_words(command) == shlex.split(command)
+
+
+def test_parse_command_rejects_empty_string():
+    with pytest.raises(ValueError):
+        parse_command("   ")
+
+
+def test_load_config_prefers_testsight_toml(tmp_path):
+    (tmp_path / "pyproject.toml").write_text(
+        '[tool.testsight]\ntest-command = "pytest -x"\n', encoding="utf-8"
+    )
+    assert load_config(root=tmp_path).test_command == ("pytest", "-x")
+
+    (tmp_path / "testsight.toml").write_text(
+        '[testsight]\ntest-command = "pytest -q"\n', encoding="utf-8"
+    )
+    assert load_config(root=tmp_path).test_command == ("pytest", "-q")
+
+
+def test_load_config_rereads_edited_file_without_growing_cache(tmp_path):
+    from testsight.config import _TOML_CACHE
+
+    config_file = tmp_path / "testsight.toml"
+    for flags in ("-q", "-vv", "-vvv"):
+        config_file.write_text(
+            f'[testsight]\ntest-command = "pytest {flags}"\n', encoding="utf-8"
+        )
+        assert load_config(root=tmp_path).test_command == ("pytest", flags)
+    assert sum(key == str(config_file) for key in _TOML_CACHE) == 1
+
+
+def test_load_config_ignores_missing_explicit_file(tmp_path):
+    config = load_config(root=tmp_path, config_path=tmp_path / "missing.toml")
+    assert config.test_command == DEFAULT_TEST_COMMAND
+
+
+def test_find_repo_root_returns_nearest_repository(tmp_path):
+    (tmp_path / ".git").mkdir()
+    (tmp_path / "pkg" / "sub").mkdir(parents=True)
+    inner = tmp_path / "vendor" / "inner"
+    (inner / ".git").mkdir(parents=True)
+    (inner / "pkg").mkdir()
+
+    assert find_repo_root(tmp_path / "pkg" / "sub") == tmp_path
+    assert find_repo_root(inner / "pkg") == inner
+
+
+def test_default_cache_lives_outside_the_checkout(tmp_path):
+    config = RunnerConfig(root=tmp_path / "repo")
+    assert config.cache_path == tmp_path / "xdg-cache" / "testsight"
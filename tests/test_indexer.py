@@ -1,7 +1,16 @@
 from __future__ import annotations
 
+import pytest
+
 from testsight.config import RunnerConfig
-from testsight.indexer import ModuleIndexer, analyze_module, build_module_data
+from testsight.indexer import (
+    ModuleIndexer,
+    analyze_module,
+    analyze_modules,
+    build_module_data,
+    clear_parse_cache,
+    safe_parse,
+)
 
 
 def test_indexer_handles_src_layout(tmp_path):
@@ -54,8 +63,158 @@ def use(value):
 
     data = analyze_module(info)
     assert {"CONSTANT", "use", "root", "math"}.issubset(data.exports)
-    assert "math" in data.imports
+    assert ("math", None) in data.imports
 
     module_data, reverse = build_module_data(ModuleIndexer(config).build())
     assert module_name in module_data
     assert module_name in reverse.get("math", {}).get(None, set())
+
+
+def test_analyze_module_uses_persistent_cache(tmp_path, monkeypatch):
+    module = tmp_path / "cached.py"
+    module.write_text("from math import sqrt\n\nVALUE = 1\n", encoding="utf-8")
+    cache_dir = tmp_path / ".testsight_cache"
+
+    config = RunnerConfig(root=tmp_path)
+    info = ModuleIndexer(config).build().modules["cached"]
+
+    first = analyze_module(info, cache_dir)
+    assert (cache_dir / ".gitignore").exists()
+
+    def fail_parse(*args, **kwargs):
+        raise AssertionError("cached module must not be re-parsed")
+
+    monkeypatch.setattr("testsight.indexer._parse_bytes", fail_parse)
+    clear_parse_cache()
+    assert analyze_module(info, cache_dir) == first
+
+    module.write_text("from math import ceil\n", encoding="utf-8")
+    monkeypatch.undo()
+    assert ("math", "ceil") in analyze_module(info, cache_dir).imports
+
+
+@pytest.mark.parametrize(
+    "payload",
+    [
+        b"\x80\x04K\x01.",  # a pickle, never to be unpickled
+        b"{not json",
+        b"[1, 2]",
+        b'{"exports": "abc", "imports": []}',
+        b'{"exports": [], "imports": [["math", 1]]}',
+    ],
+)
+def test_persistent_cache_rejects_foreign_entries(tmp_path, payload):
+    module = tmp_path / "cached.py"
+    module.write_text("import math\n", encoding="utf-8")
+    cache_dir = tmp_path / "cache"
+
+    config = RunnerConfig(root=tmp_path)
+    info = ModuleIndexer(config).build().modules["cached"]
+    analyze_module(info, cache_dir)
+    (entry,) = cache_dir.glob("ast/*/*/*.json")
+    entry.write_bytes(payload)
+
+    clear_parse_cache()
+    assert ("math", None) in analyze_module(info, cache_dir).imports
+
+
+def test_safe_parse_tolerates_invalid_source(tmp_path):
+    module = tmp_path / "mod.py"
+    module.write_text("VALUE = 1\n", encoding="utf-8")
+    assert safe_parse(module) is not None
+
+    module.write_text("def broken(:\n", encoding="utf-8")
+    assert safe_parse(module) is None
+    assert safe_parse(tmp_path / "missing.py") is None
+
+
+def test_analysis_memo_keeps_one_entry_per_module(tmp_path):
+    from testsight.indexer import _ANALYSIS_MEMO
+
+    module = tmp_path / "mod.py"
+    config = RunnerConfig(root=tmp_path)
+    clear_parse_cache()
+    for idx in range(5):
+        module.write_text(f"VALUE = {'1' * (idx + 1)}\n", encoding="utf-8")
+        info = ModuleIndexer(config).build().modules["mod"]
+        assert "VALUE" in analyze_module(info).exports
+    assert len(_ANALYSIS_MEMO) == 1
+
+
+def test_analyze_modules_parallel_matches_serial(tmp_path, monkeypatch):
+    for idx in range(4):
+        (tmp_path / f"mod{idx}.py").write_text(
+            f"from math import sqrt\n\nVALUE_{idx} = {idx}\n", encoding="utf-8"
+        )
+    infos = list(ModuleIndexer(RunnerConfig(root=tmp_path)).build().modules.values())
+
+    monkeypatch.setattr("testsight.indexer.PARALLEL_MIN_MODULES", 0)
+    assert analyze_modules(infos, workers=2) == analyze_modules(infos, workers=1)
+
+
+def test_analyze_modules_parallel_results_fill_the_memo(tmp_path, monkeypatch):
+    from testsight.indexer import _ANALYSIS_MEMO
+
+    for idx in range(4):
+        (tmp_path / f"mod{idx}.py").write_text("import math\n", encoding="utf-8")
+    infos = list(ModuleIndexer(RunnerConfig(root=tmp_path)).build().modules.values())
+    clear_parse_cache()
+
+    monkeypatch.setattr("testsight.indexer.PARALLEL_MIN_MODULES", 0)
+    first = analyze_modules(infos, workers=2)
+    assert len(_ANALYSIS_MEMO) == len(infos)
+
+    def no_pool(*args, **kwargs):
+        raise AssertionError("memo hits must not start a worker pool")
+
+    monkeypatch.setattr("testsight.indexer.ProcessPoolExecutor", no_pool)
+    assert analyze_modules(infos, workers=2) == first
+
+
+def test_analyze_module_scopes_exports_but_keeps_nested_imports(tmp_path):
+    (tmp_path / "scoped.py").write_text(
+        """
+try:
+    import json
+except ImportError:
+    json = None
+
+if True:
+    FLAG = 1
+
+
+class Service:
+    attribute = 1
+
+    def run(self):
+        from os import path
+        local = path
+        return local
+""".strip()
+        + "\n",
+        encoding="utf-8",
+    )
+
+    info = ModuleIndexer(RunnerConfig(root=tmp_path)).build().modules["scoped"]
+    data = analyze_module(info)
+
+    assert {"json", "FLAG", "Service"}.issubset(data.exports)
+    assert not {"attribute", "run", "local", "path"} & data.exports
+    assert ("os", "path") in data.imports
+
+
+def test_analyze_module_resolves_relative_imports(tmp_path):
+    (tmp_path / "pkg" / "sub").mkdir(parents=True)
+    (tmp_path / "pkg" / "__init__.py").write_text("from .sub import mod\n", encoding="utf-8")
+    (tmp_path / "pkg" / "sub" / "__init__.py").write_text("", encoding="utf-8")
+    (tmp_path / "pkg" / "sub" / "mod.py").write_text(
+        "from . import sibling\nfrom ..helpers import tool\n", encoding="utf-8"
+    )
+
+    modules = ModuleIndexer(RunnerConfig(root=tmp_path)).build().modules
+
+    assert analyze_module(modules["pkg"]).imports == (("pkg.sub", "mod"),)
+    assert analyze_module(modules["pkg.sub.mod"]).imports == (
+        ("pkg.sub", "sibling"),
+        ("pkg.helpers", "tool"),
+    )
@@ -3,7 +3,7 @@ from __future__ import annotations
 from pathlib import Path
 
 from testsight.config import RunnerConfig, TokenConfig
-from testsight.indexer import ModuleIndexer
+from testsight.indexer import ModuleIndex, ModuleIndexer, ModuleInfo
 from testsight.resolver import ImpactResolver, prepare_analysis
 
 
@@ -114,3 +114,54 @@ def test_resolver_returns_sorted_paths(tmp_path):
     changed = [tmp_path / "tests" / "zeta_test.py", tmp_path / "feature.py"]
     tests = resolver.resolve(changed)
     assert tests == sorted(tests)
+
+
+def test_resolver_follows_transitive_imports(tmp_path):
+    make_basic_layout(tmp_path)
+    (tmp_path / "wrapper.py").write_text(
+        "import feature\n\n\ndef wrap(x):\n    return feature.compute(x)\n",
+        encoding="utf-8",
+    )
+    (tmp_path / "tests" / "test_wrapper.py").write_text(
+        "import wrapper\n\n\ndef test_wrap():\n    assert wrapper.wrap(1) == 2\n",
+        encoding="utf-8",
+    )
+
+    config = RunnerConfig(root=tmp_path)
+    index = ModuleIndexer(config).build()
+    analysis = prepare_analysis(index)
+    resolver = ImpactResolver(config, index, analysis)
+
+    tests = resolver.resolve([tmp_path / "feature.py"])
+    assert tests == [
+        tmp_path / "tests" / "test_feature.py",
+        tmp_path / "tests" / "test_wrapper.py",
+    ]
+
+
+def test_resolver_sorts_hand_built_index(tmp_path):
+    (tmp_path / "tests").mkdir()
+    names = ["test_zeta", "test_mid", "test_alpha"]
+    modules = {}
+    for name in names:
+        path = tmp_path / "tests" / f"{name}.py"
+        path.write_text("import feature\n", encoding="utf-8")
+        modules[f"tests.{name}"] = ModuleInfo(
+            name=f"tests.{name}",
+            path=path,
+            package_parts=("tests",),
+            is_package=False,
+        )
+    feature = tmp_path / "feature.py"
+    feature.write_text("VALUE = 1\n", encoding="utf-8")
+    modules["feature"] = ModuleInfo(
+        name="feature", path=feature, package_parts=(), is_package=False
+    )
+    index = ModuleIndex(
+        modules=modules, by_path={info.path: name for name, info in modules.items()}
+    )
+    config = RunnerConfig(root=tmp_path)
+    resolver = ImpactResolver(config, index, prepare_analysis(index))
+
+    tests = resolver.resolve([feature])
+    assert tests == sorted(tmp_path / "tests" / f"{name}.py" for name in names)
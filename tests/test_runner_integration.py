@@ -2,13 +2,15 @@ from __future__ import annotations
 
 import json
 import subprocess
+import sys
 from dataclasses import replace
 
 import pytest
 
+from testsight.cli import build_parser, parse_args
 from testsight.cli import main as cli_main
 from testsight.config import DiffSource
-from testsight.runner import ChangeDetector, TestsightRunner
+from testsight.runner import ChangeDetectionError, ChangeDetector, TestsightRunner
 
 
 @pytest.fixture
@@ -125,6 +127,49 @@ def test_change_detector_range_mode(seeded_repo):
     assert any(path.name == "service.py" for path in paths)
 
 
+def test_change_detector_drops_staged_deletions(seeded_repo):
+    repo = seeded_repo
+    repo.remove("tests/app/test_service.py")
+
+    base_config = repo.runner_config()
+    diff = replace(base_config.diff, diff_filter="ACMRD")
+    detector = ChangeDetector(base_config.with_overrides(diff=diff))
+    assert detector.collect() == []
+
+
+def test_change_detector_skips_staged_files_removed_from_worktree(seeded_repo):
+    repo = seeded_repo
+    staged = repo.write("tests/app/test_extra.py", "def test_extra():\n    pass\n")
+    repo.stage("tests/app/test_extra.py")
+    staged.unlink()
+
+    detector = ChangeDetector(repo.runner_config())
+    assert staged not in detector.collect()
+
+
+def test_change_detector_reports_git_failure(seeded_repo):
+    repo = seeded_repo
+    base_config = repo.runner_config()
+    diff = replace(
+        base_config.diff, mode=DiffSource.RANGE, base="no-such-ref", head="HEAD"
+    )
+    detector = ChangeDetector(base_config.with_overrides(diff=diff))
+    with pytest.raises(ChangeDetectionError, match="no-such-ref"):
+        detector.collect()
+
+
+def test_change_detector_survives_noisy_git_stderr(seeded_repo):
+    repo = seeded_repo
+    detector = ChangeDetector(repo.runner_config())
+    # More stderr than a pipe buffer holds, written before any stdout.
+    script = (
+        "import sys; sys.stderr.write('warning: LF will be replaced\\n' * 20000);"
+        " sys.stdout.write('a.py\\0b.py\\0')"
+    )
+    entries = list(detector._iter_git([sys.executable, "-c", script], "failed"))
+    assert entries == [b"a.py", b"b.py", b""]
+
+
 def test_cli_json_output(seeded_repo, capsys):
     repo = seeded_repo
     repo.write("src/app/util.py", "def adjust(value):\n    return value + 10\n")
@@ -171,3 +216,63 @@ def test_change_detector_includes_untracked(seeded_repo):
     detector = ChangeDetector(config)
     paths = detector.collect()
     assert any(path.name == "new_module.py" for path in paths)
+
+
+def test_change_detector_handles_unusual_file_names(seeded_repo):
+    repo = seeded_repo
+    repo.write("src/app/módulo con espacio.py", "VALUE = 1\n")
+    repo.stage(".")
+
+    detector = ChangeDetector(repo.runner_config())
+    paths = detector.collect()
+    assert repo.root / "src/app/módulo con espacio.py" in paths
+
+
+def test_cli_changed_only_skips_impact_analysis(seeded_repo, capsys, monkeypatch):
+    repo = seeded_repo
+    repo.write("src/app/util.py", "def adjust(value):\n    return value + 7\n")
+    repo.write("tests/app/test_util.py", "def test_util():\n    assert True\n")
+    repo.stage(".")
+
+    def fail_build(self):
+        raise AssertionError("--changed-only must not build the module index")
+
+    monkeypatch.setattr("testsight.indexer.ModuleIndexer.build", fail_build)
+    code = cli_main(["--root", str(repo.root), "--json", "--changed-only"])
+    assert code == 0
+    data = json.loads(capsys.readouterr().out)
+    assert data == ["tests/app/test_util.py"]
+
+
+@pytest.mark.parametrize(
+    "argv", [[], ["--json"], ["--dry-run", "--quiet"], ["--version", "--json"]]
+)
+def test_cli_fast_path_matches_argparse(argv):
+    assert vars(parse_args(argv)) == vars(build_parser().parse_args(argv))
+
+
+def test_runner_reuses_analysis_until_sources_change(seeded_repo, monkeypatch):
+    repo = seeded_repo
+    from testsight.resolver import prepare_analysis
+
+    calls = []
+
+    def counting(*args, **kwargs):
+        calls.append(args)
+        return prepare_analysis(*args, **kwargs)
+
+    monkeypatch.setattr("testsight.runner.prepare_analysis", counting)
+    runner = TestsightRunner(repo.runner_config())
+    util = repo.root / "src/app/util.py"
+
+    assert repo.root / "tests/app/test_service.py" in runner.plan([util])
+    assert repo.root / "tests/app/test_service.py" in runner.plan([util])
+    assert len(calls) == 1
+
+    repo.write("src/app/extra.py", "VALUE = 1\n")
+    runner.plan([util])
+    assert len(calls) == 2
+
+    runner.invalidate()
+    runner.plan([util])
+    assert len(calls) == 3
@@ -11,6 +11,20 @@ def test_split_token_handles_camel_case(tmp_path):
     assert {"feature", "toggle", "manager"}.issubset(tokens)
 
 
+def test_split_token_keeps_acronyms_and_digits_together(tmp_path):
+    config = RunnerConfig(root=tmp_path)
+    collector = TokenCollector(tmp_path, config)
+    tokens = collector._split_token("HTTPServer2Client")
+    assert {"http", "server2", "client"}.issubset(tokens)
+
+
+def test_split_token_handles_non_ascii_camel_case(tmp_path):
+    config = RunnerConfig(root=tmp_path)
+    collector = TokenCollector(tmp_path, config)
+    tokens = collector._split_token("gestionÉtatŞehir")
+    assert {"gestion", "état", "şehir"}.issubset(tokens)
+
+
 def test_path_tokens_filters_stopwords(tmp_path):
     config = RunnerConfig(root=tmp_path)
     collector = TokenCollector(tmp_path, config)